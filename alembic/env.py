@@ -4,6 +4,7 @@ from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 
 from alembic import context
+import os
 import sys
 from pathlib import Path
 
@@ -12,7 +13,6 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # Importer les modèles et la configuration
 from src.config import get_settings
-from src.database import engine
 from src.model import Base
 
 # this is the Alembic Config object
@@ -22,9 +22,10 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-# Ajouter l'URL de la base de données depuis les settings
-settings = get_settings()
-config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+# Ajouter l'URL de la base de données depuis l'environnement si elle y est
+# définie (cas Docker/CI), sinon depuis les settings (.env)
+database_url = os.environ.get("DATABASE_URL") or get_settings().DATABASE_URL
+config.set_main_option("sqlalchemy.url", database_url)
 
 # Ajouter les attributs de votre modèle pour autogenerate support
 target_metadata = Base.metadata
@@ -63,8 +64,19 @@ def run_migrations_online() -> None:
 
     Dans ce scénario, nous devons créer un Engine
     et associer une connexion avec le contexte.
+
+    Une migration n'utilise qu'une connexion le temps de son exécution :
+    l'Engine est créé avec NullPool plutôt que de réutiliser le pool
+    applicatif de src.database. Comme ce dernier, il regroupe les
+    executemany en INSERT multi-VALUES (UPDATE/DELETE par lots).
     """
-    connectable = engine
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+        executemany_mode="values_plus_batch",
+        insertmanyvalues_page_size=1000,
+    )
 
     with connectable.connect() as connection:
         context.configure(
@@ -7,12 +7,13 @@ du code métier et en offrant des fonctions auxiliaires pour les opérations
 répétitives.
 """
 import logging
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Tuple
 from pathlib import Path
-import json
 
+import orjson
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 
@@ -20,6 +21,27 @@ from sqlalchemy.orm import Session
 logger = logging.getLogger('alembic.env')
 
 
+# Tables légères utilisées pour construire les requêtes d'upsert sans dépendre
+# des modèles SQLAlchemy de l'application (qui peuvent évoluer après la migration)
+regions_table = sa.table(
+    'regions',
+    sa.column('id', sa.Integer),
+    sa.column('name', sa.String),
+    sa.column('created_at', sa.DateTime(timezone=True)),
+    sa.column('updated_at', sa.DateTime(timezone=True)),
+)
+
+departments_table = sa.table(
+    'departments',
+    sa.column('id', sa.Integer),
+    sa.column('name', sa.String),
+    sa.column('code_departement', sa.String),
+    sa.column('region_id', sa.Integer),
+    sa.column('created_at', sa.DateTime(timezone=True)),
+    sa.column('updated_at', sa.DateTime(timezone=True)),
+)
+
+
 # ============================================================================
 # Helpers de Logging
 # ============================================================================
@@ -33,34 +55,36 @@ class MigrationLogger:
     @staticmethod
     def log_migration_start(migration_name: str) -> None:
         """Log le début d'une migration."""
-        logger.info(f"=== Début de la migration: {migration_name} ===")
+        logger.info("=== Début de la migration: %s ===", migration_name)
 
     @staticmethod
     def log_migration_end(migration_name: str) -> None:
         """Log la fin d'une migration."""
-        logger.info(f"=== Migration terminée avec succès: {migration_name} ===")
+        logger.info("=== Migration terminée avec succès: %s ===", migration_name)
 
     @staticmethod
     def log_downgrade_start(migration_name: str) -> None:
         """Log le début d'un downgrade."""
-        logger.info(f"=== Début du downgrade: {migration_name} ===")
+        logger.info("=== Début du downgrade: %s ===", migration_name)
 
     @staticmethod
     def log_downgrade_end(migration_name: str) -> None:
         """Log la fin d'un downgrade."""
-        logger.info(f"=== Downgrade terminé avec succès: {migration_name} ===")
+        logger.info("=== Downgrade terminé avec succès: %s ===", migration_name)
 
     @staticmethod
     def log_error(operation: str, error: Exception) -> None:
         """Log une erreur lors d'une opération."""
-        logger.error(f"Erreur lors de {operation}: {error}")
+        logger.error("Erreur lors de %s: %s", operation, error)
 
     @staticmethod
     def log_summary(summary: Dict[str, int]) -> None:
-        """Log un résumé des opérations effectuées."""
-        logger.info("=== Résumé de la migration ===")
-        for key, value in summary.items():
-            logger.info(f"{key}: {value}")
+        """Log un résumé des opérations effectuées, sur une seule ligne."""
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "=== Résumé de la migration === %s",
+                ", ".join(f"{key}: {value}" for key, value in summary.items())
+            )
 
 
 # ============================================================================
@@ -91,12 +115,12 @@ class DataValidator:
                 "Veuillez exécuter le script ETL pour le générer."
             )
 
-        logger.info(f"Lecture du fichier JSON: {file_path}")
+        logger.info("Lecture du fichier JSON: %s", file_path)
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        except json.JSONDecodeError as e:
+            with open(file_path, 'rb') as f:
+                data = orjson.loads(f.read())
+        except orjson.JSONDecodeError as e:
             raise ValueError(f"Le fichier JSON n'est pas valide: {e}")
 
         return data
@@ -118,7 +142,7 @@ class DataValidator:
         if not isinstance(data['regions'], list):
             raise ValueError("La clé 'regions' doit être une liste")
 
-        logger.info(f"Nombre de régions à traiter: {len(data['regions'])}")
+        logger.info("Nombre de régions à traiter: %d", len(data['regions']))
 
     @staticmethod
     def validate_region_data(region_data: Dict[str, Any]) -> bool:
@@ -136,12 +160,12 @@ class DataValidator:
             return False
 
         if 'departements' not in region_data:
-            logger.warning(f"Région {region_data['nom']} sans 'departements', ignorée")
+            logger.warning("Région %s sans 'departements', ignorée", region_data['nom'])
             return False
 
         if not isinstance(region_data['departements'], list):
             logger.warning(
-                f"La clé 'departements' de {region_data['nom']} doit être une liste"
+                "La clé 'departements' de %s doit être une liste", region_data['nom']
             )
             return False
 
@@ -161,7 +185,7 @@ class DataValidator:
         """
         if 'code' not in dept_data or 'nom' not in dept_data:
             logger.warning(
-                f"Département sans 'code' ou 'nom' détecté dans {region_name}, ignoré"
+                "Département sans 'code' ou 'nom' détecté dans %s, ignoré", region_name
             )
             return False
 
@@ -187,176 +211,125 @@ class DatabaseOperations:
         return Session(bind=bind)
 
     @staticmethod
-    def find_region_by_name(session: Session, name: str) -> Optional[int]:
+    def load_region_ids(session: Session) -> Dict[str, int]:
         """
-        Trouve une région par son nom.
+        Charge toutes les régions existantes en une seule requête.
 
         Args:
             session: Session SQLAlchemy
-            name: Nom de la région
 
         Returns:
-            L'ID de la région si trouvée, None sinon
+            Un dictionnaire {nom: id}
         """
-        result = session.execute(
-            sa.text("SELECT id FROM regions WHERE name = :name"),
-            {'name': name}
-        ).fetchone()
-        return result[0] if result else None
+        result = session.execute(sa.text("SELECT name, id FROM regions"))
+        return {name: region_id for name, region_id in result}
 
     @staticmethod
-    def insert_region(session: Session, name: str) -> int:
+    def load_departments(session: Session) -> Dict[str, Tuple[int, str]]:
         """
-        Insère une nouvelle région.
+        Charge tous les départements existants en une seule requête.
 
         Args:
             session: Session SQLAlchemy
-            name: Nom de la région
 
         Returns:
-            L'ID de la région créée
+            Un dictionnaire {code: (region_id, nom)}
         """
         result = session.execute(
-            sa.text("""
-                INSERT INTO regions (name, created_at, updated_at)
-                VALUES (:name, NOW(), NOW())
-                RETURNING id
-            """),
-            {'name': name}
+            sa.text("SELECT code_departement, region_id, name FROM departments")
         )
-        return result.fetchone()[0]
+        return {code: (region_id, name) for code, region_id, name in result}
 
     @staticmethod
-    def find_department_by_code(session: Session, code: str) -> Optional[Tuple[int, int]]:
+    def bulk_insert_regions(session: Session, names: List[str]) -> Tuple[Dict[str, int], int]:
         """
-        Trouve un département par son code.
+        Insère toutes les régions manquantes en une seule requête.
+
+        Seules les régions absentes de la base (cf. load_region_ids) sont
+        transmises : un simple INSERT ... RETURNING suffit à récupérer leurs IDs
+        en un aller-retour, sans dépendre d'une contrainte d'unicité sur le nom.
 
         Args:
             session: Session SQLAlchemy
-            code: Code du département
+            names: Noms des régions à créer
 
         Returns:
-            Un tuple (id, region_id) si trouvé, None sinon
+            Un tuple (dictionnaire {nom: id}, nombre de régions créées)
         """
-        result = session.execute(
-            sa.text("SELECT id, region_id FROM departments WHERE code_departement = :code"),
-            {'code': code}
-        ).fetchone()
-        return result if result else None
+        if not names:
+            return {}, 0
 
-    @staticmethod
-    def insert_department(
-        session: Session,
-        name: str,
-        code: str,
-        region_id: int
-    ) -> None:
-        """
-        Insère un nouveau département.
+        stmt = insert(regions_table).values([
+            {'name': name, 'created_at': sa.func.now(), 'updated_at': sa.func.now()}
+            for name in dict.fromkeys(names)
+        ]).returning(regions_table.c.id, regions_table.c.name)
 
-        Args:
-            session: Session SQLAlchemy
-            name: Nom du département
-            code: Code du département
-            region_id: ID de la région
-        """
-        session.execute(
-            sa.text("""
-                INSERT INTO departments (name, code_departement, region_id, created_at, updated_at)
-                VALUES (:name, :code, :region_id, NOW(), NOW())
-            """),
-            {'name': name, 'code': code, 'region_id': region_id}
-        )
+        region_ids = {row.name: row.id for row in session.execute(stmt)}
+        return region_ids, len(region_ids)
 
     @staticmethod
-    def update_department(
-        session: Session,
-        dept_id: int,
-        name: str,
-        region_id: int
-    ) -> None:
+    def bulk_upsert_departments(session: Session, rows: List[Dict[str, Any]]) -> Tuple[int, int]:
         """
-        Met à jour un département.
+        Insère ou met à jour tous les départements en une seule requête.
 
-        Args:
-            session: Session SQLAlchemy
-            dept_id: ID du département
-            name: Nouveau nom du département
-            region_id: Nouvel ID de la région
-        """
-        session.execute(
-            sa.text("""
-                UPDATE departments
-                SET name = :name, region_id = :region_id, updated_at = NOW()
-                WHERE id = :id
-            """),
-            {'name': name, 'region_id': region_id, 'id': dept_id}
-        )
-
-    @staticmethod
-    def update_department_name(session: Session, dept_id: int, name: str) -> None:
-        """
-        Met à jour uniquement le nom d'un département.
+        Les départements sont identifiés par leur code (contrainte uq_department_code).
+        Un département existant n'est réécrit que si son nom ou sa région a changé.
 
         Args:
             session: Session SQLAlchemy
-            dept_id: ID du département
-            name: Nouveau nom du département
-        """
-        session.execute(
-            sa.text("""
-                UPDATE departments
-                SET name = :name, updated_at = NOW()
-                WHERE id = :id
-            """),
-            {'name': name, 'id': dept_id}
-        )
-
-    @staticmethod
-    def get_department_name(session: Session, dept_id: int) -> str:
-        """
-        Récupère le nom d'un département.
-
-        Args:
-            session: Session SQLAlchemy
-            dept_id: ID du département
+            rows: Liste de dictionnaires {'name', 'code_departement', 'region_id'}
 
         Returns:
-            Le nom du département
+            Un tuple (departments_created, departments_updated)
         """
-        result = session.execute(
-            sa.text("SELECT name FROM departments WHERE id = :id"),
-            {'id': dept_id}
-        ).fetchone()
-        return result[0] if result else ""
+        if not rows:
+            return 0, 0
+
+        # Un même code ne peut apparaître qu'une fois par INSERT ... ON CONFLICT DO UPDATE
+        rows_by_code = {row['code_departement']: row for row in rows}
+
+        stmt = insert(departments_table).values([
+            {**row, 'created_at': sa.func.now(), 'updated_at': sa.func.now()}
+            for row in rows_by_code.values()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['code_departement'],
+            set_={
+                'name': stmt.excluded.name,
+                'region_id': stmt.excluded.region_id,
+                'updated_at': sa.func.now(),
+            },
+            where=sa.or_(
+                departments_table.c.name != stmt.excluded.name,
+                departments_table.c.region_id != stmt.excluded.region_id,
+            ),
+        ).returning(sa.literal_column('xmax = 0').label('inserted'))
+
+        created = 0
+        updated = 0
+        for row in session.execute(stmt):
+            if row.inserted:
+                created += 1
+            else:
+                updated += 1
+        return created, updated
 
     @staticmethod
-    def count_table_rows(session: Session, table_name: str) -> int:
+    def truncate_tables(session: Session, *table_names: str) -> None:
         """
-        Compte le nombre de lignes dans une table.
+        Vide plusieurs tables en une seule instruction TRUNCATE.
 
-        Args:
-            session: Session SQLAlchemy
-            table_name: Nom de la table
-
-        Returns:
-            Le nombre de lignes
-        """
-        result = session.execute(
-            sa.text(f"SELECT COUNT(*) FROM {table_name}")
-        ).fetchone()
-        return result[0] if result else 0
-
-    @staticmethod
-    def delete_all_from_table(session: Session, table_name: str) -> None:
-        """
-        Supprime toutes les lignes d'une table.
+        Contrairement à DELETE, TRUNCATE ne parcourt pas les lignes une à une
+        (pas de WAL par ligne). Les séquences sont réinitialisées et les tables
+        qui référencent celles-ci (ex: cities) sont vidées aussi (CASCADE).
 
         Args:
             session: Session SQLAlchemy
-            table_name: Nom de la table
+            *table_names: Noms des tables à vider
         """
-        session.execute(sa.text(f"DELETE FROM {table_name}"))
+        session.execute(
+            sa.text(f"TRUNCATE TABLE {', '.join(table_names)} RESTART IDENTITY CASCADE")
+        )
 
 
 # ============================================================================
@@ -41,172 +41,42 @@ JSON_FILE_PATH = Path(__file__).parent.parent.parent / 'data' / 'regions_departm
 # Fonctions auxiliaires pour la migration
 # ============================================================================
 
-def process_region(session: Session, region_data: dict) -> tuple[int, int, int]:
+def collect_departments(regions: list[dict], region_ids: dict[str, int]) -> list[dict]:
     """
-    Traite une région et ses départements.
+    Aplatit les départements des régions données.
 
     Args:
-        session: Session SQLAlchemy
-        region_data: Données de la région
-
-    Returns:
-        Un tuple (regions_created, regions_updated, departments_created, departments_updated)
-    """
-    regions_created = 0
-    regions_updated = 0
-    departments_created = 0
-    departments_updated = 0
-
-    # Valider les données de la région
-    if not DataValidator.validate_region_data(region_data):
-        return (0, 0, 0, 0)
-
-    region_name = region_data['nom']
-
-    # Upsert de la région (insérer ou mettre à jour)
-    region_id = DatabaseOperations.find_region_by_name(session, region_name)
-
-    if region_id:
-        # La région existe déjà
-        MigrationLogger.logger.debug(f"Région existante trouvée: {region_name} (ID: {region_id})")
-        regions_updated += 1
-    else:
-        # Insérer une nouvelle région
-        region_id = DatabaseOperations.insert_region(session, region_name)
-        MigrationLogger.logger.info(f"Nouvelle région créée: {region_name} (ID: {region_id})")
-        regions_created += 1
-
-    # Traiter les départements de cette région
-    dept_stats = process_departments(session, region_data['departements'], region_id, region_name)
-    departments_created += dept_stats[0]
-    departments_updated += dept_stats[1]
-
-    return (regions_created, regions_updated, departments_created, departments_updated)
-
-
-def process_departments(
-    session: Session,
-    departments_data: list,
-    region_id: int,
-    region_name: str
-) -> tuple[int, int]:
-    """
-    Traite les départements d'une région.
-
-    Args:
-        session: Session SQLAlchemy
-        departments_data: Liste des données des départements
-        region_id: ID de la région
-        region_name: Nom de la région
-
-    Returns:
-        Un tuple (departments_created, departments_updated)
-    """
-    departments_created = 0
-    departments_updated = 0
-
-    for dept_data in departments_data:
-        # Valider les données du département
-        if not DataValidator.validate_department_data(dept_data, region_name):
-            continue
-
-        dept_code = dept_data['code']
-        dept_name = dept_data['nom']
-
-        # Upsert du département
-        dept_result = process_department(session, dept_code, dept_name, region_id, region_name)
-        departments_created += dept_result[0]
-        departments_updated += dept_result[1]
-
-    return (departments_created, departments_updated)
-
-
-def process_department(
-    session: Session,
-    dept_code: str,
-    dept_name: str,
-    region_id: int,
-    region_name: str
-) -> tuple[int, int]:
-    """
-    Traite un département individuel (insérer ou mettre à jour).
-
-    Args:
-        session: Session SQLAlchemy
-        dept_code: Code du département
-        dept_name: Nom du département
-        region_id: ID de la région
-        region_name: Nom de la région
+        regions: Régions du JSON déjà validées (cf. DataValidator.validate_region_data)
+        region_ids: Dictionnaire {nom de région: ID}
 
     Returns:
-        Un tuple (created, updated) avec 1 dans la position appropriée
-    """
-    # Chercher le département existant
-    dept = DatabaseOperations.find_department_by_code(session, dept_code)
-
-    if dept:
-        # Le département existe déjà
-        dept_id, old_region_id = dept
-        return update_existing_department(
-            session, dept_id, dept_code, dept_name, old_region_id, region_id
-        )
-    else:
-        # Insérer un nouveau département
-        DatabaseOperations.insert_department(session, dept_name, dept_code, region_id)
-        MigrationLogger.logger.info(
-            f"Nouveau département créé: {dept_code} ({dept_name}) "
-            f"dans région {region_name} (ID: {region_id})"
-        )
-        return (1, 0)
-
-
-def update_existing_department(
-    session: Session,
-    dept_id: int,
-    dept_code: str,
-    dept_name: str,
-    old_region_id: int,
-    region_id: int
-) -> tuple[int, int]:
+        La liste des départements avec leur region_id résolu, un seul par code
+        (le dernier rencontré l'emporte)
     """
-    Met à jour un département existant si nécessaire.
-
-    Args:
-        session: Session SQLAlchemy
-        dept_id: ID du département
-        dept_code: Code du département
-        dept_name: Nouveau nom du département
-        old_region_id: Ancien ID de la région
-        region_id: Nouvel ID de la région
-
-    Returns:
-        Un tuple (created, updated) avec 1 dans la position appropriée
-    """
-    # Vérifier si la région a changé
-    if old_region_id != region_id:
-        DatabaseOperations.update_department(session, dept_id, dept_name, region_id)
-        MigrationLogger.logger.debug(
-            f"Département {dept_code} ({dept_name}) mis à jour: "
-            f"région {old_region_id} -> {region_id}"
-        )
-        return (0, 1)
-
-    # Vérifier si le nom a changé
-    current_name = DatabaseOperations.get_department_name(session, dept_id)
-    if current_name != dept_name:
-        DatabaseOperations.update_department_name(session, dept_id, dept_name)
-        MigrationLogger.logger.debug(
-            f"Département {dept_code} nom mis à jour: {current_name} -> {dept_name}"
-        )
-        return (0, 1)
-
-    return (0, 0)
+    rows_by_code = {}
+    for region_data in regions:
+        region_name = region_data['nom']
+        for dept_data in region_data['departements']:
+            # Valider les données du département
+            if not DataValidator.validate_department_data(dept_data, region_name):
+                continue
+
+            rows_by_code[dept_data['code']] = {
+                'name': dept_data['nom'],
+                'code_departement': dept_data['code'],
+                'region_id': region_ids[region_name],
+            }
+    return list(rows_by_code.values())
 
 
 def populate_database(session: Session, data: dict) -> dict:
     """
     Peuple la base de données avec les régions et départements.
 
+    Les régions et départements existants sont chargés une fois en mémoire,
+    puis seules les lignes nouvelles ou modifiées sont envoyées, en une
+    requête INSERT par table.
+
     Args:
         session: Session SQLAlchemy
         data: Données JSON chargées
@@ -214,24 +84,34 @@ def populate_database(session: Session, data: dict) -> dict:
     Returns:
         Un dictionnaire avec les statistiques de la migration
     """
-    # Compteurs pour le résumé
-    stats = {
-        'Régions créées': 0,
-        'Régions mises à jour': 0,
-        'Départements créés': 0,
-        'Départements mis à jour': 0,
+    valid_regions = [r for r in data['regions'] if DataValidator.validate_region_data(r)]
+    region_names = list(dict.fromkeys(r['nom'] for r in valid_regions))
+
+    # Insertion des seules régions absentes de la base
+    region_ids = DatabaseOperations.load_region_ids(session)
+    missing_regions = [name for name in region_names if name not in region_ids]
+    new_region_ids, regions_created = DatabaseOperations.bulk_insert_regions(
+        session, missing_regions
+    )
+    region_ids.update(new_region_ids)
+
+    # Upsert des seuls départements nouveaux ou modifiés
+    existing_departments = DatabaseOperations.load_departments(session)
+    departments = [
+        row for row in collect_departments(valid_regions, region_ids)
+        if existing_departments.get(row['code_departement']) != (row['region_id'], row['name'])
+    ]
+    departments_created, departments_updated = DatabaseOperations.bulk_upsert_departments(
+        session, departments
+    )
+
+    return {
+        'Régions créées': regions_created,
+        'Régions mises à jour': len(region_names) - regions_created,
+        'Départements créés': departments_created,
+        'Départements mis à jour': departments_updated,
     }
 
-    # Traiter chaque région
-    for region_data in data['regions']:
-        result = process_region(session, region_data)
-        stats['Régions créées'] += result[0]
-        stats['Régions mises à jour'] += result[1]
-        stats['Départements créés'] += result[2]
-        stats['Départements mis à jour'] += result[3]
-
-    return stats
-
 
 # ============================================================================
 # Fonctions de migration Alembic
@@ -283,7 +163,8 @@ def downgrade() -> None:
     Supprime toutes les régions et départements de la base de données.
 
     Note: Cette opération est destructive et supprimera toutes les données
-    des tables regions et departments.
+    des tables regions et departments, ainsi que des tables qui les
+    référencent (cities).
     """
     # ### commands auto generated by Alembic - please adjust! ###
 
@@ -293,18 +174,8 @@ def downgrade() -> None:
     session = DatabaseOperations.get_session()
 
     try:
-        # Compter les éléments avant suppression
-        dept_count = DatabaseOperations.count_table_rows(session, 'departments')
-        region_count = DatabaseOperations.count_table_rows(session, 'regions')
-
-        MigrationLogger.logger.info(f"Départements à supprimer: {dept_count}")
-        MigrationLogger.logger.info(f"Régions à supprimer: {region_count}")
-
-        # Supprimer tous les départements (d'abord à cause de la FK)
-        DatabaseOperations.delete_all_from_table(session, 'departments')
-
-        # Supprimer toutes les régions
-        DatabaseOperations.delete_all_from_table(session, 'regions')
+        # Vider départements et régions en une seule instruction
+        DatabaseOperations.truncate_tables(session, 'departments', 'regions')
 
         session.commit()
 
@@ -1,6 +1,8 @@
+import time
 from datetime import datetime, timezone
 
-from fastapi import FastAPI
+import orjson
+from fastapi import FastAPI, Response
 
 from src.config import get_settings
 from src.routes.regions import router as regions_router
@@ -10,40 +12,112 @@ from src.routes.cities import router as cities_router
 # Import des modèles pour garantir qu'ils sont enregistrés dans le registre de SQLAlchemy
 from src.model import Base, Region, Department, City
 
-app = FastAPI(
+fastapi_app = FastAPI(
     title="Digitalism API",
     description="API pour la gestion des régions, départements et communes françaises",
     version="1.0.0"
 )
 
 # Inclusion des routeurs
-app.include_router(regions_router)
-app.include_router(departments_router)
-app.include_router(cities_router)
+fastapi_app.include_router(regions_router)
+fastapi_app.include_router(departments_router)
+fastapi_app.include_router(cities_router)
 
 
-@app.get("/")
+# Contenu constant de la route racine, sérialisé une seule fois à l'import
+_ROOT_BODY = orjson.dumps({
+    "message": "Bienvenue sur l'API Digitalism",
+    "docs": "/docs",
+    "redoc": "/redoc"
+})
+
+
+@fastapi_app.get("/")
 def read_root():
-    return {
-        "message": "Bienvenue sur l'API Digitalism",
-        "docs": "/docs",
-        "redoc": "/redoc"
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
-@app.get("/health")
+@fastapi_app.get("/health")
 def health_check():
     """
     Vérifie la santé de l'application.
     
     Returns:
-        dict: Statut de l'application avec timestamp UTC.
+        Response: Statut de l'application avec timestamp UTC, en JSON.
     
     Cet endpoint peut être utilisé par les orchestrateurs de conteneurs
     ou les load balancers pour vérifier que l'application fonctionne.
     """
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "service": "digitalism-fastapi"
-    }
\ No newline at end of file
+    return Response(content=_health_response()[1], media_type="application/json")
+
+
+# Cache de la réponse du health check : [seconde, contenu sérialisé, en-têtes]
+_health_cache: list = [None, b"", []]
+
+
+def _health_response() -> tuple[list, bytes]:
+    """
+    Construit les en-têtes et le contenu JSON de la réponse du health check.
+
+    Le contenu est recalculé et sérialisé au plus une fois par seconde :
+    les appels suivants dans la même seconde le réutilisent. Les en-têtes,
+    dont content-length, sont reconstruits en même temps que le contenu.
+
+    Returns:
+        tuple: (en-têtes ASGI, statut de l'application avec timestamp UTC
+        sérialisé en JSON).
+    """
+    now = int(time.time())
+    if now != _health_cache[0]:
+        body = orjson.dumps({
+            "status": "healthy",
+            "timestamp": datetime.fromtimestamp(now, timezone.utc).isoformat(),
+            "service": "digitalism-fastapi"
+        })
+        _health_cache[:] = [now, body, [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ]]
+    return _health_cache[2], _health_cache[1]
+
+
+def health_interceptor(asgi_app):
+    """
+    Enveloppe une application ASGI pour répondre directement à GET /health.
+
+    Les sondes de liveness/readiness des orchestrateurs interrogent /health
+    en continu : la requête est servie au niveau ASGI, sans traverser le
+    routage ni les dépendances FastAPI. Toutes les autres requêtes sont
+    transmises telles quelles à l'application.
+
+    Args:
+        asgi_app: Application ASGI à envelopper.
+
+    Returns:
+        L'application ASGI enveloppée.
+    """
+    async def interceptor(scope, receive, send):
+        if (
+            scope["type"] == "http"
+            and scope["path"] == "/health"
+            and scope["method"] == "GET"
+        ):
+            headers, body = _health_response()
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": headers,
+            })
+            await send({
+                "type": "http.response.body",
+                "body": body,
+            })
+            return
+        await asgi_app(scope, receive, send)
+
+    return interceptor
+
+
+# Application ASGI servie par uvicorn (src.app:app) ; l'instance FastAPI
+# reste accessible via fastapi_app (routes, OpenAPI, tests)
+app = health_interceptor(fastapi_app)
\ No newline at end of file
@@ -11,6 +11,15 @@ class DigitalismSettings(BaseSettings):
 
     CSV_DATA_PATH: str = "data/csv"
 
+    # Pool de connexions (par processus uvicorn : workers × (pool + overflow)
+    # doit rester sous max_connections de PostgreSQL, 100 par défaut)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 5.0
+    DB_POOL_RECYCLE: int = 1800
+    # Durée maximale d'une requête SQL en millisecondes (0 = pas de limite)
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+
     @field_validator('DATABASE_URL')
     @classmethod
     def validate_database_url(cls, v: str) -> str:
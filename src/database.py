@@ -1,24 +1,42 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
-from typing import Generator
+from contextlib import contextmanager
+from typing import Generator, Iterator
 from src.config import get_settings
 
 settings = get_settings()
 
+# Options passées à psycopg2 à l'ouverture de chaque connexion
+connect_args = {}
+if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+    connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+
 engine = create_engine(
     settings.DATABASE_URL,
     poolclass=QueuePool,
-    pool_size=5,
-    max_overflow=10,
-    pool_pre_ping=True,  # Vérifie les connexions avant utilisation
-    pool_recycle=3600,   # Recycle les connexions après 1 heure
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,  # Échoue vite plutôt que de mettre en file
+    # Recycle les connexions avant les coupures d'inactivité, sans le
+    # SELECT 1 de pool_pre_ping à chaque checkout
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    connect_args=connect_args,
+    # Regroupe les executemany (INSERT multi-VALUES, UPDATE/DELETE par lots)
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=1000,
     echo=False
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@event.listens_for(SessionLocal, "after_flush")
+def _mark_session_written(session: Session, flush_context) -> None:
+    """Marque la session comme ayant envoyé des écritures à la base."""
+    session.info["has_writes"] = True
+
+
 def get_db() -> Generator[Session, None, None]:
     """
     Générateur de session de base de données pour FastAPI.
@@ -26,13 +44,16 @@ def get_db() -> Generator[Session, None, None]:
     Yields:
         Session: Session SQLAlchemy active.
     
-    Le commit est automatique en cas de succès, rollback en cas d'erreur,
-    et la session est toujours fermée dans le bloc finally.
+    Le commit est automatique en cas de succès si la requête a écrit en base,
+    rollback en cas d'erreur, et la session est toujours fermée dans le bloc
+    finally. Les requêtes en lecture seule ne font pas de COMMIT : la
+    transaction est simplement libérée à la fermeture de la session.
     """
     db = SessionLocal()
     try:
         yield db
-        db.commit()
+        if db.info.get("has_writes") or db.new or db.dirty or db.deleted:
+            db.commit()
     except Exception:
         db.rollback()
         raise
@@ -40,16 +61,29 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-def get_etl_db() -> Session:
+@contextmanager
+def etl_session() -> Iterator[Session]:
     """
-    Crée une session de base de données pour les scripts ETL.
-    
-    Returns:
+    Context manager de session de base de données pour les scripts ETL.
+
+    Yields:
         Session: Session SQLAlchemy active pour les scripts ETL.
-    
-    Note:
-        Contrairement à get_db(), cette fonction ne gère pas automatiquement
-        le commit/rollback. Le script ETL doit gérer ces opérations explicitement.
-        La session doit être fermée manuellement avec session.close().
+
+    Le commit est effectué à la sortie du bloc en cas de succès, rollback en
+    cas d'erreur (y compris KeyboardInterrupt), et la session est toujours
+    fermée, ce qui rend sa connexion au pool.
+
+    Example:
+        with etl_session() as db:
+            loader = CityLoader(db)
+            loader.load(cities)
     """
-    return SessionLocal()
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+    finally:
+        db.close()
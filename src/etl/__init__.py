@@ -53,6 +53,7 @@ from src.etl.utils import (
     validate_csv_row,
     get_csv_value,
     normalize_name,
+    normalize_name_cached,
 )
 
 __all__ = [
@@ -83,4 +84,5 @@ __all__ = [
     "validate_csv_row",
     "get_csv_value",
     "normalize_name",
+    "normalize_name_cached",
 ]
@@ -22,6 +22,8 @@ CSV_FILE_PATH: Final[Path] = DATA_DIR / "csv" / "communes_departements.csv"
 CSV_ENCODING: Final[str] = "utf-8"
 CSV_DELIMITER: Final[str] = ","
 CSV_QUOTECHAR: Final[str] = '"'
+# Taille du tampon de lecture du fichier CSV (1 Mio)
+CSV_READ_BUFFER_SIZE: Final[int] = 1 << 20
 
 # Noms des colonnes attendus dans le CSV
 # Le CSV doit contenir au minimum ces colonnes
@@ -37,7 +39,7 @@ CSV_COLUMN_CITY_LATITUDE: Final[str] = "latitude"
 CSV_COLUMN_CITY_LONGITUDE: Final[str] = "longitude"
 
 # Configuration du traitement
-BATCH_SIZE: Final[int] = 100  # Nombre d'objets à créer par batch
+BATCH_SIZE: Final[int] = 1000  # Nombre d'objets à créer par batch
 
 # Configuration de la gestion des doublons
 DEFAULT_DUPLICATE_HANDLING: Final[Literal["skip", "replace"]] = "skip"
@@ -58,5 +60,7 @@ GEO_API_CACHE_FILE: Final[Path] = DATA_DIR / "cache" / "geo_api_communes.json"
 GEO_API_FORCE_REFRESH: bool = False
 # Nombre maximum de tentatives en cas d'erreur pour l'API Géo
 GEO_API_MAX_RETRIES: Final[int] = 3
-# Délai entre les tentatives (en secondes) pour l'API Géo
+# Délai de base entre les tentatives (en secondes) pour l'API Géo
 GEO_API_RETRY_DELAY: Final[float] = 5.0
+# Délai maximum entre deux tentatives (en secondes) pour l'API Géo
+GEO_API_MAX_RETRY_DELAY: Final[float] = 30.0
@@ -10,7 +10,7 @@ from pathlib import Path
 from typing import Iterator, Dict, Any, Optional
 
 from src.etl.extractors.base_extractor import BaseExtractor
-from src.etl.config import CSV_ENCODING, CSV_DELIMITER, CSV_QUOTECHAR
+from src.etl.config import CSV_ENCODING, CSV_DELIMITER, CSV_QUOTECHAR, CSV_READ_BUFFER_SIZE
 
 
 class CSVReader(BaseExtractor):
@@ -50,14 +50,17 @@ class CSVReader(BaseExtractor):
         self.encoding = encoding or CSV_ENCODING
         self.delimiter = delimiter or CSV_DELIMITER
         self.quotechar = quotechar or CSV_QUOTECHAR
+        # Itérateur en cours, fermé par __exit__ s'il n'a pas été consommé
+        self._rows: Optional[Iterator[Dict[str, Any]]] = None
 
     def read(self) -> Iterator[Dict[str, Any]]:
         """
         Lit le fichier CSV et retourne un itérateur de dictionnaires.
 
-        Cette méthode utilise DictReader du module csv pour lire le fichier
-        ligne par ligne. La première ligne est utilisée comme en-tête pour
-        les clés des dictionnaires.
+        Cette méthode utilise csv.reader pour lire le fichier ligne par ligne.
+        La première ligne est utilisée comme en-tête pour les clés des
+        dictionnaires, construits directement par zip (sans le surcoût de
+        DictReader par ligne). Les lignes vides sont ignorées.
 
         Yields:
             Dictionnaire représentant une ligne du CSV, où les clés sont
@@ -68,6 +71,19 @@ class CSVReader(BaseExtractor):
             IOError: Si une erreur de lecture survient
             csv.Error: Si le format CSV est invalide
         """
+        self._rows = self._read_rows()
+        return self._rows
+
+    def _read_rows(self) -> Iterator[Dict[str, Any]]:
+        """
+        Générateur qui lit le fichier CSV ligne par ligne (voir read()).
+
+        Le fichier n'est ouvert qu'au premier élément demandé et reste ouvert
+        jusqu'à la fin de l'itération ou la fermeture du générateur.
+
+        Yields:
+            Dictionnaire représentant une ligne du CSV
+        """
         if not self.file_path.exists():
             self.logger.error(f"Fichier CSV introuvable: {self.file_path}")
             raise FileNotFoundError(f"Le fichier CSV n'existe pas: {self.file_path}")
@@ -75,25 +91,32 @@ class CSVReader(BaseExtractor):
         self.logger.info(f"Ouverture du fichier CSV: {self.file_path}")
 
         try:
-            with open(self.file_path, "r", encoding=self.encoding, newline="") as csvfile:
-                reader = csv.DictReader(
+            with open(
+                self.file_path,
+                "r",
+                buffering=CSV_READ_BUFFER_SIZE,
+                encoding=self.encoding,
+                newline="",
+            ) as csvfile:
+                reader = csv.reader(
                     csvfile,
                     delimiter=self.delimiter,
                     quotechar=self.quotechar,
                 )
 
                 # Vérifier que le fichier a des colonnes
-                if not reader.fieldnames:
+                fieldnames = next(reader, None)
+                if not fieldnames:
                     self.logger.error("Le fichier CSV ne contient pas d'en-tête")
                     raise csv.Error("Le fichier CSV ne contient pas d'en-tête")
 
-                self.logger.info(f"Colonnes détectées: {list(reader.fieldnames)}")
+                self.logger.info(f"Colonnes détectées: {fieldnames}")
 
-                # Itérer sur les lignes
-                for row_number, row in enumerate(reader, start=1):
-                    yield row
+                # Itérer sur les lignes (sans compteur par ligne : le nombre de
+                # lignes lues est fourni par reader.line_num)
+                yield from (dict(zip(fieldnames, row)) for row in reader if row)
 
-                self.logger.info(f"Fin de la lecture du fichier CSV ({row_number} lignes lues)")
+                self.logger.info(f"Fin de la lecture du fichier CSV ({reader.line_num} lignes lues, en-tête compris)")
 
         except csv.Error as e:
             self.logger.error(f"Erreur CSV à la lecture du fichier: {e}")
@@ -115,9 +138,14 @@ class CSVReader(BaseExtractor):
         """
         Context manager exit.
 
+        Ferme l'itérateur retourné par read() s'il n'a pas été entièrement
+        consommé, ce qui ferme immédiatement le fichier CSV.
+
         Args:
             exc_type: Type de l'exception si une erreur s'est produite
             exc_val: Valeur de l'exception
             exc_tb: Traceback de l'exception
         """
-        pass
+        if self._rows is not None:
+            self._rows.close()
+            self._rows = None
@@ -2,18 +2,23 @@
 Loader pour les communes (City) dans le pipeline ETL.
 
 Ce module implémente un loader qui charge les communes transformées
-en base de données en utilisant le CityRepository.
+en base de données en masse (COPY ou INSERT par lots, upsert par lots).
 """
 
-from typing import List, Literal
+import csv
+import io
+from typing import Dict, List, Literal, Optional, Tuple
+from sqlalchemy import func, insert, literal_column, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
+from src.etl.config import BATCH_SIZE
 from src.etl.loaders.base_loader import BaseLoader
 from src.etl.utils.data_models import CityData
 from src.model.city import City
 from src.repository.city import CityRepository
 from src.repository.department import DepartmentRepository
-from src.schemas.city import CityCreate, CityUpdate
+from src.utils.date import get_current_time
 
 
 class CityLoader(BaseLoader[CityData]):
@@ -22,7 +27,7 @@ class CityLoader(BaseLoader[CityData]):
 
     Ce loader est responsable de charger les communes transformées
     en base de données. Il résout les department_id depuis les codes postaux
-    et utilise CityRepository pour l'insertion ou la mise à jour.
+    et insère ou met à jour les communes par lots de BATCH_SIZE.
 
     Attributes:
         db: Session de base de données
@@ -46,43 +51,65 @@ class CityLoader(BaseLoader[CityData]):
         self.city_repository = CityRepository(db)
         self.department_repository = DepartmentRepository(db)
         self.duplicate_handling = duplicate_handling
+        self._department_ids: Optional[Dict[str, int]] = None
 
-    def _prepare_departments(self, data: List[CityData]) -> dict:
+    def _get_department_ids(self) -> Dict[str, int]:
         """
-        Prépare et valide les départements nécessaires pour les communes.
+        Retourne les IDs des départements indexés par code.
 
-        Args:
-            data: Liste des communes à charger
+        Les départements sont chargés en une requête au premier appel puis
+        conservés sur le loader : ils ne changent pas pendant un run ETL, et
+        les appels suivants à load() ne refont pas la requête.
 
         Returns:
-            Dictionnaire des départements indexés par code
+            Dictionnaire {code département: department_id}
         """
-        # Récupérer tous les codes départements uniques nécessaires
-        code_departements = set()
-        for city_data in data:
-            code_departement = City.calculate_department_from_postal_code(city_data.code_postal)
-            code_departements.add(code_departement)
+        if self._department_ids is None:
+            self._department_ids = self.department_repository.get_all_ids_by_code()
+        return self._department_ids
 
-        # Récupérer tous les départements nécessaires en une seule requête
-        departments = {}
-        if code_departements:
-            departments = self.department_repository.get_by_codes(list(code_departements))
+    def _prepare_departments(self, data: List[CityData]) -> Dict[str, int]:
+        """
+        Prépare et valide les départements nécessaires pour les communes.
 
-            # Avertir si certains départements n'existent pas (ne pas lever d'erreur)
-            missing_departments = code_departements - set(departments.keys())
-            if missing_departments:
-                warning_msg = f"Départements non trouvés (ignorés): {', '.join(missing_departments)}"
-                self.logger.warning(warning_msg)
+        Le code département n'est calculé qu'une fois par code postal distinct,
+        et les IDs des départements proviennent du cache du loader.
 
-        return departments
+        Args:
+            data: Liste des communes à charger
 
-    def _prepare_cities(self, data: List[CityData], departments: dict) -> List[dict]:
+        Returns:
+            Dictionnaire {code postal: department_id} pour les codes postaux
+            dont le département existe
+        """
+        # Calculer le code département de chaque code postal distinct
+        department_codes = {
+            code_postal: City.calculate_department_from_postal_code(code_postal)
+            for code_postal in {city_data.code_postal for city_data in data}
+        }
+        code_departements = set(department_codes.values())
+
+        department_ids = self._get_department_ids()
+
+        # Avertir si certains départements n'existent pas (ne pas lever d'erreur)
+        missing_departments = code_departements - department_ids.keys()
+        if missing_departments:
+            warning_msg = f"Départements non trouvés (ignorés): {', '.join(missing_departments)}"
+            self.logger.warning(warning_msg)
+
+        return {
+            code_postal: department_ids[code_departement]
+            for code_postal, code_departement in department_codes.items()
+            if code_departement in department_ids
+        }
+
+    def _prepare_cities(self, data: List[CityData], departments: Dict[str, int]) -> List[dict]:
         """
         Convertit les CityData en dictionnaires pour le chargement.
 
         Args:
             data: Liste des communes à charger
-            departments: Dictionnaire des départements indexés par code
+            departments: Dictionnaire {code postal: department_id}
 
         Returns:
             Liste des dictionnaires de communes à traiter
@@ -91,17 +118,15 @@ class CityLoader(BaseLoader[CityData]):
         skipped_no_dept = 0
         
         for city_data in data:
-            code_departement = City.calculate_department_from_postal_code(city_data.code_postal)
+            department_id = departments.get(city_data.code_postal)
             
             # Vérifier que le département existe
-            if code_departement not in departments:
+            if department_id is None:
                 skipped_no_dept += 1
                 continue
-            
-            department_id = departments[code_departement].id
 
             city_dict = {
-                "name": city_data.name.upper(),  # Assurer l'uppercase
+                "name": city_data.name,  # Déjà normalisé en majuscules par CityTransformer
                 "code_postal": city_data.code_postal,
                 "department_id": department_id,
             }
@@ -119,6 +144,166 @@ class CityLoader(BaseLoader[CityData]):
 
         return cities_to_process
 
+    def _insert_in_batches(self, cities: List[dict]) -> None:
+        """
+        Insère les communes par lots de BATCH_SIZE.
+
+        Chaque lot est envoyé en une seule instruction executemany (INSERT
+        multi-VALUES côté psycopg2) au lieu d'un INSERT suivi d'un SELECT
+        de rafraîchissement par commune.
+
+        Args:
+            cities: Liste des dictionnaires de communes à insérer
+        """
+        for start in range(0, len(cities), BATCH_SIZE):
+            self.db.execute(insert(City), cities[start:start + BATCH_SIZE])
+
+    def _supports_copy(self) -> bool:
+        """
+        Indique si la connexion permet COPY FROM STDIN (pilote psycopg2).
+
+        Returns:
+            True si COPY peut être utilisé, False sinon
+        """
+        return self.db.get_bind().dialect.driver == "psycopg2"
+
+    def _copy_cities(self, cities: List[dict], table: str = "cities") -> None:
+        """
+        Insère les communes avec COPY FROM STDIN (PostgreSQL/psycopg2).
+
+        Les lignes sont sérialisées en CSV en mémoire puis envoyées en un seul
+        flux COPY, sans analyse ni planification SQL par ligne côté serveur.
+        Le COPY s'exécute dans la transaction de la session.
+
+        Args:
+            cities: Liste des dictionnaires de communes à insérer
+            table: Table de destination (cities ou table temporaire)
+        """
+        now = get_current_time().isoformat()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for city in cities:
+            # Un champ vide non cité est interprété comme NULL par COPY
+            writer.writerow((
+                city["name"],
+                city["code_postal"],
+                city["department_id"],
+                city.get("latitude", ""),
+                city.get("longitude", ""),
+                now,
+                now,
+            ))
+        buffer.seek(0)
+
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table} (name, code_postal, department_id, latitude, longitude, "
+                "created_at, updated_at) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        finally:
+            cursor.close()
+
+    def _create_cities(self, cities: List[dict]) -> None:
+        """
+        Insère les nouvelles communes avec la méthode la plus rapide disponible.
+
+        COPY est utilisé avec psycopg2 ; les autres pilotes utilisent des
+        INSERT par lots.
+
+        Args:
+            cities: Liste des dictionnaires de communes à insérer
+        """
+        if not cities:
+            return
+        if self._supports_copy():
+            self._copy_cities(cities)
+        else:
+            self._insert_in_batches(cities)
+
+    def _upsert_in_batches(self, cities: List[dict]) -> Tuple[int, int]:
+        """
+        Insère ou met à jour les communes par lots de BATCH_SIZE.
+
+        Chaque lot est envoyé en une seule requête
+        INSERT ... ON CONFLICT (name, code_postal) DO UPDATE : la détection des
+        doublons est faite par PostgreSQL, sans préchargement des communes
+        existantes. Les coordonnées absentes du lot ne remplacent pas celles
+        déjà en base.
+
+        Args:
+            cities: Liste des dictionnaires de communes à charger
+
+        Returns:
+            Un tuple (communes créées, communes mises à jour)
+        """
+        created = 0
+        updated = 0
+        for start in range(0, len(cities), BATCH_SIZE):
+            stmt = pg_insert(City).values([
+                {"latitude": None, "longitude": None, **city}
+                for city in cities[start:start + BATCH_SIZE]
+            ])
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_city_name_code_postal",
+                set_={
+                    "department_id": stmt.excluded.department_id,
+                    "latitude": func.coalesce(stmt.excluded.latitude, City.latitude),
+                    "longitude": func.coalesce(stmt.excluded.longitude, City.longitude),
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            ).returning(
+                # xmax = 0 uniquement pour les lignes nouvellement insérées
+                literal_column("xmax = 0").label("inserted")
+            )
+            for row in self.db.execute(stmt):
+                if row.inserted:
+                    created += 1
+                else:
+                    updated += 1
+        return created, updated
+
+    def _copy_upsert_cities(self, cities: List[dict]) -> Tuple[int, int]:
+        """
+        Insère ou met à jour les communes via COPY dans une table temporaire.
+
+        Les communes sont chargées par COPY dans tmp_cities, puis fusionnées
+        dans cities en une seule requête INSERT ... SELECT ... ON CONFLICT,
+        avec les mêmes règles que _upsert_in_batches.
+
+        Args:
+            cities: Liste des dictionnaires de communes à charger
+
+        Returns:
+            Un tuple (communes créées, communes mises à jour)
+        """
+        self.db.execute(text("""
+            CREATE TEMP TABLE tmp_cities AS
+            SELECT name, code_postal, department_id, latitude, longitude, created_at, updated_at
+            FROM cities WITH NO DATA
+        """))
+        self._copy_cities(cities, table="tmp_cities")
+        created, updated = self.db.execute(text("""
+            WITH upserted AS (
+                INSERT INTO cities (name, code_postal, department_id, latitude, longitude,
+                                    created_at, updated_at)
+                SELECT name, code_postal, department_id, latitude, longitude,
+                       created_at, updated_at
+                FROM tmp_cities
+                ON CONFLICT ON CONSTRAINT uq_city_name_code_postal DO UPDATE SET
+                    department_id = EXCLUDED.department_id,
+                    latitude = COALESCE(EXCLUDED.latitude, cities.latitude),
+                    longitude = COALESCE(EXCLUDED.longitude, cities.longitude),
+                    updated_at = EXCLUDED.updated_at
+                RETURNING xmax = 0 AS inserted
+            )
+            SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted)
+            FROM upserted
+        """)).one()
+        self.db.execute(text("DROP TABLE tmp_cities"))
+        return created, updated
+
     def _process_skip_mode(self, cities_to_process: List[dict]) -> int:
         """
         Traite les communes en mode skip (ignorer les doublons).
@@ -130,22 +315,18 @@ class CityLoader(BaseLoader[CityData]):
             Nombre de communes créées
         """
         # Charger toutes les villes existantes en une seule requête pour optimiser
-        from sqlalchemy import select
-        stmt = select(City).where(City.deleted_at.is_(None))
-        existing_cities = list(self.db.execute(stmt).scalars().all())
-        
-        # Créer un dictionnaire pour une recherche rapide
-        existing_dict = {(c.name, c.code_postal): c for c in existing_cities}
+        existing_ids = self.city_repository.get_ids_by_name_and_postal_code()
         
-        count = 0
+        to_create = []
         skipped = 0
         for city_dict in cities_to_process:
             key = (city_dict["name"], city_dict["code_postal"])
-            if key in existing_dict:
+            if key in existing_ids:
                 skipped += 1
             else:
-                self.city_repository.create(city_dict)
-                count += 1
+                to_create.append(city_dict)
+        self._create_cities(to_create)
+        count = len(to_create)
         self._log_success(count, f"{count} commune(s) chargée(s) avec succès, {skipped} doublon(s) ignoré(s)")
         return count
 
@@ -159,28 +340,12 @@ class CityLoader(BaseLoader[CityData]):
         Returns:
             Nombre total de communes traitées (créées + mises à jour)
         """
-        # Charger toutes les villes existantes en une seule requête pour optimiser
-        from sqlalchemy import select
-        stmt = select(City).where(City.deleted_at.is_(None))
-        existing_cities = list(self.db.execute(stmt).scalars().all())
-        
-        # Créer un dictionnaire pour une recherche rapide
-        existing_dict = {(c.name, c.code_postal): c for c in existing_cities}
-        
-        count = 0
-        updated = 0
-        for city_dict in cities_to_process:
-            key = (city_dict["name"], city_dict["code_postal"])
-            if key in existing_dict:
-                # Mettre à jour la commune existante
-                existing = existing_dict[key]
-                update_data = CityUpdate(**city_dict)
-                self.city_repository.update(existing, update_data)
-                updated += 1
-            else:
-                # Créer la nouvelle commune
-                self.city_repository.create(city_dict)
-                count += 1
+        if not cities_to_process:
+            count, updated = 0, 0
+        elif self._supports_copy():
+            count, updated = self._copy_upsert_cities(cities_to_process)
+        else:
+            count, updated = self._upsert_in_batches(cities_to_process)
         self._log_success(count, f"{count} commune(s) créée(s), {updated} commune(s) mise(s) à jour")
         return count + updated
 
@@ -188,9 +353,9 @@ class CityLoader(BaseLoader[CityData]):
         """
         Charge les communes en base de données.
 
-        Cette méthode convertit les CityData en objets CityCreate,
+        Cette méthode convertit les CityData en dictionnaires,
         résout les department_id depuis les codes postaux,
-        et utilise CityRepository pour l'insertion ou la mise à jour
+        et insère ou met à jour les communes par lots
         selon la stratégie de gestion des doublons.
 
         Args:
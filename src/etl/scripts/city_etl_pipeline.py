@@ -17,7 +17,7 @@ from src.etl.transformers.city_transformer import CityTransformer
 from src.etl.loaders.city_loader import CityLoader
 from src.etl.config import CSV_FILE_PATH, DEFAULT_DUPLICATE_HANDLING
 from src.etl.services import GeoApiService
-from src.database import get_etl_db
+from src.database import etl_session
 
 
 def run_city_etl_pipeline(
@@ -45,11 +45,6 @@ def run_city_etl_pipeline(
         FileNotFoundError: Si le fichier CSV n'existe pas
         ValueError: Si les données ne peuvent pas être transformées ou chargées
     """
-    # Étape 1: Extract - Lecture du fichier CSV
-    extractor = CSVReader(file_path=CSV_FILE_PATH)
-    raw_data = extractor.read()
-
-    # Étape 2: Transform - Nettoyage et normalisation des données
     # Créer le service de géocodage si nécessaire
     geocoding_service = None
     if enable_geocoding:
@@ -59,19 +54,19 @@ def run_city_etl_pipeline(
         enable_geocoding=enable_geocoding,
         geocoding_service=geocoding_service
     )
-    cities = transformer.transform(raw_data, enable_geocoding=enable_geocoding)
+
+    # Étape 1: Extract - Lecture du fichier CSV en flux
+    # Étape 2: Transform - Nettoyage et normalisation des données
+    # Le context manager garantit la fermeture du fichier même si la
+    # transformation échoue en cours de lecture
+    with CSVReader(file_path=CSV_FILE_PATH) as extractor:
+        raw_data = extractor.read()
+        cities = transformer.transform(raw_data, enable_geocoding=enable_geocoding)
 
     # Étape 3: Load - Insertion en base de données
-    db = get_etl_db()
-    try:
+    with etl_session() as db:
         loader = CityLoader(db, duplicate_handling=duplicate_handling)
         count = loader.load(cities)
-        db.commit()
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
 
     return count
 
@@ -11,25 +11,25 @@ Le JSON généré est stocké dans data/regions_departments.json
 """
 
 import csv
-import json
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Any, Set, Tuple
-
-from src.etl.utils.csv_helpers import clean_string, normalize_name, get_csv_value
+from typing import Dict, Iterable, Iterator, List, Any, Set, Tuple
+
+import orjson
+
+from src.etl.config import (
+    DATA_DIR,
+    CSV_FILE_PATH,
+    CSV_ENCODING,
+    CSV_DELIMITER,
+    CSV_QUOTECHAR,
+    CSV_COLUMN_REGION,
+    CSV_COLUMN_DEPARTMENT,
+    CSV_COLUMN_CODE_DEPARTMENT,
+)
+from src.etl.utils.csv_helpers import normalize_name_cached
 from src.etl.utils.logger import get_etl_logger
 
-# Configuration
-DATA_DIR: Path = Path("data")
-CSV_FILE_PATH: Path = DATA_DIR / "csv" / "communes_departements.csv"
-CSV_ENCODING: str = "utf-8"
-CSV_DELIMITER: str = ","
-CSV_QUOTECHAR: str = '"'
-
-# Noms des colonnes attendus dans le CSV
-CSV_COLUMN_REGION: str = "nom_region"
-CSV_COLUMN_DEPARTMENT: str = "nom_departement"
-CSV_COLUMN_CODE_DEPARTMENT: str = "code_departement"
-
 # Logger
 logger = get_etl_logger("generate_regions_departments_json")
 
@@ -67,18 +67,24 @@ def validate_data(regions_data: List[Dict[str, Any]]) -> bool:
     return True
 
 
-def read_csv(file_path: Path) -> List[Dict[str, str]]:
+def read_csv(file_path: Path) -> Iterator[Tuple[str, str, str]]:
     """
-    Lit le fichier CSV et retourne les lignes sous forme de dictionnaires.
+    Lit le fichier CSV en flux et produit les colonnes utiles de chaque ligne.
+
+    Les lignes sont lues avec csv.reader : les index des colonnes région,
+    département et code département sont résolus une fois depuis l'en-tête,
+    puis chaque ligne est produite dès sa lecture, sans conserver le fichier
+    en mémoire.
 
     Args:
         file_path: Chemin vers le fichier CSV
 
-    Returns:
-        Liste des lignes du CSV sous forme de dictionnaires
+    Yields:
+        Un tuple (région, département, code département) par ligne
 
     Raises:
         FileNotFoundError: Si le fichier CSV n'existe pas
+        ValueError: Si l'en-tête est absent ou incomplet
         IOError: Si une erreur de lecture survient
     """
     if not file_path.exists():
@@ -86,104 +92,98 @@ def read_csv(file_path: Path) -> List[Dict[str, str]]:
 
     logger.info(f"Lecture du fichier CSV: {file_path}")
 
-    rows = []
     with open(file_path, "r", encoding=CSV_ENCODING, newline="") as csvfile:
-        reader = csv.DictReader(
+        reader = csv.reader(
             csvfile,
             delimiter=CSV_DELIMITER,
             quotechar=CSV_QUOTECHAR,
         )
 
         # Vérifier que le fichier a des colonnes
-        if not reader.fieldnames:
+        header = next(reader, None)
+        if not header:
             raise ValueError("Le fichier CSV ne contient pas d'en-tête")
 
-        logger.info(f"Colonnes détectées: {list(reader.fieldnames)}")
+        logger.info(f"Colonnes détectées: {header}")
 
-        # Lire les lignes
-        for row_number, row in enumerate(reader, start=1):
-            rows.append(row)
+        required_columns = (CSV_COLUMN_REGION, CSV_COLUMN_DEPARTMENT, CSV_COLUMN_CODE_DEPARTMENT)
+        missing_columns = [column for column in required_columns if column not in header]
+        if missing_columns:
+            raise ValueError(f"Colonnes manquantes dans le fichier CSV: {missing_columns}")
+        region_index, department_index, code_index = (
+            header.index(column) for column in required_columns
+        )
+        row_length = max(region_index, department_index, code_index) + 1
 
-        logger.info(f"Fin de la lecture du fichier CSV ({row_number} lignes lues)")
+        # Lire les lignes (les lignes vides sont ignorées, comme avec DictReader)
+        row_count = 0
+        for row in reader:
+            if not row:
+                continue
+            row_count += 1
+            if len(row) < row_length:
+                logger.warning("Ligne ignorée: nombre de colonnes insuffisant (%s)", row)
+                continue
+            yield row[region_index], row[department_index], row[code_index]
 
-    return rows
+        logger.info(f"Fin de la lecture du fichier CSV ({row_count} lignes lues)")
 
 
-def extract_regions(rows: List[Dict[str, str]]) -> List[str]:
+def extract_regions_and_departments(
+    rows: Iterable[Tuple[str, str, str]],
+) -> Tuple[List[str], List[Tuple[str, str, str]]]:
     """
-    Extrait les régions uniques des données CSV.
+    Extrait les régions et les départements uniques des données CSV.
+
+    Les lignes ne sont parcourues qu'une fois, au fil de la lecture : chaque
+    colonne est normalisée une seule fois par ligne, puis alimente à la fois
+    l'ensemble des régions et le dictionnaire des départements.
 
     Args:
-        rows: Liste des lignes du CSV
+        rows: Lignes du CSV sous forme de tuples (région, département, code département)
 
     Returns:
-        Liste triée des noms de régions uniques
+        Un tuple (liste triée des noms de régions uniques,
+        liste de tuples (code_departement, nom_departement, nom_region))
     """
-    logger.info("--- Extraction des régions ---")
+    logger.info("--- Extraction des régions et départements ---")
 
     region_names: Set[str] = set()
 
-    for row in rows:
-        region_name = get_csv_value(row, CSV_COLUMN_REGION)
-        if region_name:
-            normalized_name = normalize_name(region_name)
-            if normalized_name:
-                region_names.add(normalized_name)
-
-    regions = sorted(region_names)
-    logger.info(f"✓ {len(regions)} région(s) trouvée(s)")
-
-    return regions
-
-
-def extract_departments(rows: List[Dict[str, str]]) -> List[Tuple[str, str, str]]:
-    """
-    Extrait les départements uniques des données CSV.
-
-    Args:
-        rows: Liste des lignes du CSV
-
-    Returns:
-        Liste de tuples (code_departement, nom_departement, nom_region)
-    """
-    logger.info("--- Extraction des départements ---")
+    # Les départements uniques sont identifiés par (code_departement, region_name)
+    seen_departments: Set[Tuple[str, str]] = set()
+    departments: List[Tuple[str, str, str]] = []
 
-    # Utiliser un dictionnaire pour stocker les départements uniques
-    # Clé: (code_departement, region_name)
-    departments_dict: Dict[Tuple[str, str], Tuple[str, str, str]] = {}
+    for region_name, department_name, code_departement in rows:
+        # Normaliser les données
+        normalized_region = normalize_name_cached(region_name)
+        normalized_name = normalize_name_cached(department_name)
+        normalized_code = normalize_name_cached(code_departement)
 
-    for row in rows:
-        department_name = get_csv_value(row, CSV_COLUMN_DEPARTMENT)
-        code_departement = get_csv_value(row, CSV_COLUMN_CODE_DEPARTMENT)
-        region_name = get_csv_value(row, CSV_COLUMN_REGION)
+        if normalized_region:
+            region_names.add(normalized_region)
 
         # Vérifier que toutes les colonnes requises sont présentes
-        if not department_name or not code_departement or not region_name:
-            logger.warning(f"Ligne ignorée: données incomplètes "
-                  f"(department={department_name}, code={code_departement}, region={region_name})")
-            continue
-
-        # Normaliser les données
-        normalized_name = normalize_name(department_name)
-        normalized_code = normalize_name(code_departement)
-        normalized_region = normalize_name(region_name)
-
         if not normalized_name or not normalized_code or not normalized_region:
-            logger.warning(f"Ligne ignorée: données invalides après normalisation "
-                  f"(department={normalized_name}, code={normalized_code}, region={normalized_region})")
+            logger.warning(
+                "Ligne ignorée: données incomplètes (department=%s, code=%s, region=%s)",
+                normalized_name, normalized_code, normalized_region,
+            )
             continue
 
         # Créer la clé unique pour le département
         dept_key = (normalized_code, normalized_region)
 
         # Ajouter le département s'il n'existe pas déjà
-        if dept_key not in departments_dict:
-            departments_dict[dept_key] = (normalized_code, normalized_name, normalized_region)
+        if dept_key not in seen_departments:
+            seen_departments.add(dept_key)
+            departments.append((normalized_code, normalized_name, normalized_region))
 
-    departments = list(departments_dict.values())
+    regions = sorted(region_names)
+    logger.info(f"✓ {len(regions)} région(s) trouvée(s)")
     logger.info(f"✓ {len(departments)} département(s) trouvé(s)")
 
-    return departments
+    return regions, departments
 
 
 def generate_json_structure(
@@ -194,7 +194,7 @@ def generate_json_structure(
     Génère la structure JSON attendue à partir des données extraites.
 
     Args:
-        regions: Liste des noms de régions
+        regions: Liste triée des noms de régions
         departments: Liste de tuples (code, nom, region_name)
 
     Returns:
@@ -202,36 +202,34 @@ def generate_json_structure(
     """
     logger.info("--- Génération de la structure JSON ---")
 
-    # Créer un dictionnaire pour regrouper les départements par région
-    regions_dict: Dict[str, Dict[str, Any]] = {}
-
-    # Initialiser les régions
-    for region in regions:
-        regions_dict[region] = {
-            "nom": region,
-            "departements": []
-        }
+    # Les régions sont déjà triées par nom : chaque région reçoit un index
+    # et ses départements sont regroupés dans la liste de même index
+    region_index = {region: index for index, region in enumerate(regions)}
+    department_buckets: List[List[Dict[str, str]]] = [[] for _ in regions]
 
     # Ajouter les départements à leur région respective
     for code, name, region_name in departments:
-        if region_name in regions_dict:
-            regions_dict[region_name]["departements"].append({
+        index = region_index.get(region_name)
+        if index is not None:
+            department_buckets[index].append({
                 "code": code,
                 "nom": name
             })
         else:
-            logger.warning(f"Département '{name}' ({code}) "
-                  f"a une région '{region_name}' qui n'existe pas")
+            logger.warning(
+                "Département '%s' (%s) a une région '%s' qui n'existe pas",
+                name, code, region_name,
+            )
 
     # Trier les départements par code dans chaque région
-    for region_data in regions_dict.values():
-        region_data["departements"].sort(key=lambda d: d["code"])
+    for bucket in department_buckets:
+        bucket.sort(key=itemgetter("code"))
 
-    # Retourner la liste triée par nom de région
-    return sorted(
-        regions_dict.values(),
-        key=lambda r: r["nom"]
-    )
+    # Retourner la liste des régions, dans l'ordre de leur nom
+    return [
+        {"nom": region, "departements": department_buckets[index]}
+        for index, region in enumerate(regions)
+    ]
 
 
 def main():
@@ -249,14 +247,9 @@ def main():
     logger.info("Génération du JSON des régions et départements")
     logger.info("=" * 60)
 
-    # Étape 1: Lecture du fichier CSV
-    rows = read_csv(CSV_FILE_PATH)
-
-    # Étape 2: Extraction des régions
-    regions = extract_regions(rows)
-
-    # Étape 3: Extraction des départements
-    departments = extract_departments(rows)
+    # Étapes 1 à 3: Lecture du fichier CSV en flux et extraction des régions
+    # et départements (un seul parcours)
+    regions, departments = extract_regions_and_departments(read_csv(CSV_FILE_PATH))
 
     # Étape 4: Génération de la structure JSON
     regions_data = generate_json_structure(regions, departments)
@@ -278,14 +271,10 @@ def main():
     # Créer le dossier data/ s'il n'existe pas
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Écrire le JSON avec indentation pour la lisibilité
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(
-            {"regions": regions_data},
-            f,
-            ensure_ascii=False,
-            indent=2
-        )
+    # Écrire le JSON avec indentation pour la lisibilité (orjson produit
+    # directement de l'UTF-8 non échappé)
+    with open(output_path, "wb") as f:
+        f.write(orjson.dumps({"regions": regions_data}, option=orjson.OPT_INDENT_2))
 
     # Résumé
     logger.info("=" * 60)
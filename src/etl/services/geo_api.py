@@ -6,15 +6,18 @@ Ce module fournit un service pour géocoder les villes en utilisant l'API Géo f
 et les résultats de géocodage.
 """
 
-import json
 import logging
-import re
+import os
+import pickle
+import random
 import time
 import unicodedata
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, Dict, List, Tuple
 
+import orjson
 import requests
 
 from src.etl.config import (
@@ -22,12 +25,45 @@ from src.etl.config import (
     GEO_API_CACHE_FILE,
     GEO_API_FORCE_REFRESH,
     GEO_API_MAX_RETRIES,
+    GEO_API_MAX_RETRY_DELAY,
     GEO_API_RETRY_DELAY,
 )
 
 
 logger = logging.getLogger(__name__)
 
+# Version du format de l'index sérialisé (à incrémenter si sa structure change)
+_INDEX_SNAPSHOT_VERSION = 1
+
+
+@lru_cache(maxsize=100_000)
+def _normalize_string(text: str) -> str:
+    """
+    Normalise une chaîne de caractères pour la comparaison.
+
+    Le résultat ne dépend que de l'entrée : il est mémoïsé, de sorte qu'un
+    même nom (à l'indexation comme au géocodage) n'est normalisé qu'une fois.
+
+    Args:
+        text: Texte à normaliser
+
+    Returns:
+        Texte normalisé
+    """
+    # Convertir en minuscules
+    text = text.lower()
+    # Retirer les accents (les noms déjà ASCII, comme ceux du CSV, n'en ont pas) :
+    # après décomposition des ligatures et NFKD, les diacritiques sont les seuls
+    # caractères non ASCII restants et sont supprimés par l'encodage
+    if not text.isascii():
+        # Ligatures que NFKD ne décompose pas (Nœux-les-Mines...)
+        text = text.replace('œ', 'oe').replace('æ', 'ae')
+        text = unicodedata.normalize('NFKD', text)
+        text = text.encode('ascii', 'ignore').decode('ascii')
+    # Remplacer les tirets et espaces par des espaces (split() sans argument
+    # fusionne les blancs consécutifs et retire ceux de début et de fin)
+    return ' '.join(text.replace('-', ' ').split())
+
 
 @dataclass
 class GeocodingResult:
@@ -50,7 +86,7 @@ class GeocodingResult:
     postcode: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CommuneGeoApi:
     """
     Modèle de données pour une commune issue de l'API Géo.
@@ -58,11 +94,45 @@ class CommuneGeoApi:
     Attributes:
         nom: Nom de la commune
         code: Code INSEE de la commune
-        centre: Coordonnées GPS au format GeoJSON
+        latitude: Latitude du centre de la commune
+        longitude: Longitude du centre de la commune
+        postal_code: Code postal déduit du code INSEE, calculé à la création
     """
     nom: str
     code: str
-    centre: Dict[str, Any]
+    latitude: float
+    longitude: float
+    postal_code: str = field(init=False, repr=False)
+
+    @classmethod
+    def from_api(cls, commune_data: Dict[str, Any]) -> "CommuneGeoApi":
+        """
+        Crée une commune à partir d'un élément de la réponse de l'API Géo.
+
+        Les coordonnées sont extraites une fois du format GeoJSON
+        ({"type": "Point", "coordinates": [longitude, latitude]}).
+
+        Args:
+            commune_data: Commune au format JSON de l'API Géo
+
+        Returns:
+            CommuneGeoApi
+
+        Raises:
+            KeyError: Si un champ obligatoire est absent
+        """
+        coordinates = commune_data["centre"].get("coordinates", [0, 0])
+        return cls(
+            nom=commune_data["nom"],
+            code=commune_data["code"],
+            latitude=float(coordinates[1]),
+            longitude=float(coordinates[0]),
+        )
+
+    def __post_init__(self) -> None:
+        # Pour les communes de métropole, le code postal est généralement
+        # les 5 premiers chiffres du code INSEE
+        self.postal_code = self.code[:5]
 
     def get_postal_code(self) -> str:
         """
@@ -74,9 +144,7 @@ class CommuneGeoApi:
         Returns:
             Code postal sur 5 chiffres
         """
-        # Pour les communes de métropole, le code postal est généralement
-        # les 5 premiers chiffres du code INSEE
-        return self.code[:5]
+        return self.postal_code
 
 
 class GeoApiService:
@@ -105,21 +173,43 @@ class GeoApiService:
             cache_file: Chemin du fichier de cache des communes
             force_refresh: Force le rechargement des données de l'API
             max_retries: Nombre maximum de tentatives en cas d'erreur
-            retry_delay: Délai entre les tentatives (en secondes)
+            retry_delay: Délai de base entre les tentatives (en secondes)
         """
         self.base_url = base_url
         self.cache_file = cache_file
         self.force_refresh = force_refresh
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        # Index sérialisé, à côté du cache JSON, pour les redémarrages rapides
+        self.index_file = cache_file.with_suffix(".pkl")
+
+        # Session HTTP partagée : la connexion (TCP + TLS) est réutilisée
+        # d'une tentative et d'un téléchargement à l'autre
+        self._session = requests.Session()
 
         # Cache des communes de l'API Géo
         self._communes_cache: Dict[str, CommuneGeoApi] = {}
         # Index pour la recherche par nom normalisé
         self._communes_by_name: Dict[str, List[CommuneGeoApi]] = {}
+        # Index des homonymes : (nom normalisé, code postal) et
+        # (nom normalisé, préfixe département) -> première commune correspondante
+        self._communes_by_name_and_postal: Dict[Tuple[str, str], CommuneGeoApi] = {}
+        self._communes_by_name_and_department: Dict[Tuple[str, str], CommuneGeoApi] = {}
 
-        # Charger les données de l'API Géo
-        self._load_communes_data()
+        # Les données de l'API Géo sont chargées au premier usage
+        # (voir _ensure_loaded), pas à la construction du service
+        self._loaded = False
+
+    def _ensure_loaded(self) -> None:
+        """
+        Charge les données des communes si ce n'est pas déjà fait.
+
+        Le chargement (lecture du cache ou téléchargement) n'a lieu qu'une
+        fois, au premier géocodage ou à la première consultation du cache.
+        """
+        if not self._loaded:
+            self._load_communes_data()
+            self._loaded = True
 
     def _normalize_string(self, text: str) -> str:
         """
@@ -133,14 +223,7 @@ class GeoApiService:
         Returns:
             Texte normalisé
         """
-        # Convertir en minuscules
-        text = text.lower().strip()
-        # Retirer les accents
-        text = unicodedata.normalize('NFKD', text)
-        text = ''.join([c for c in text if not unicodedata.combining(c)])
-        # Remplacer les tirets et espaces par des espaces
-        text = re.sub(r'[-\s]+', ' ', text)
-        return text
+        return _normalize_string(text)
 
     def _load_communes_data(self) -> None:
         """
@@ -152,29 +235,96 @@ class GeoApiService:
         """
         # Vérifier si le cache existe et si on doit le recharger
         if self.cache_file.exists() and not self.force_refresh:
+            if self._load_index_snapshot():
+                return
             self._load_communes_from_cache()
         else:
             self._download_communes_from_api()
 
+        if self._communes_cache:
+            self._save_index_snapshot()
+
+    def _load_index_snapshot(self) -> bool:
+        """
+        Charge les index de communes depuis l'index sérialisé (pickle).
+
+        L'index n'est utilisé que s'il est au moins aussi récent que le cache
+        JSON et au format courant : la lecture du JSON, la normalisation des
+        noms et la construction des index sont alors évitées.
+
+        Returns:
+            True si les index ont été chargés, False sinon
+        """
+        try:
+            if self.index_file.stat().st_mtime < self.cache_file.stat().st_mtime:
+                return False
+            with open(self.index_file, "rb") as f:
+                snapshot = pickle.load(f)
+            version, *indexes = snapshot
+            if version != _INDEX_SNAPSHOT_VERSION:
+                return False
+            communes, by_name, by_name_and_postal, by_name_and_department = indexes
+        except FileNotFoundError:
+            return False
+        except (
+            OSError, EOFError, pickle.UnpicklingError, ImportError,
+            AttributeError, TypeError, ValueError,
+        ) as e:
+            logger.warning(f"Index API Géo illisible, reconstruction depuis le cache: {e}")
+            return False
+
+        self._communes_cache = communes
+        self._communes_by_name = by_name
+        self._communes_by_name_and_postal = by_name_and_postal
+        self._communes_by_name_and_department = by_name_and_department
+        logger.info(f"Index API Géo chargé: {len(self._communes_cache)} communes")
+        return True
+
+    def _save_index_snapshot(self) -> None:
+        """
+        Sérialise les index de communes pour les prochains démarrages.
+
+        Le fichier est écrit dans un fichier temporaire puis renommé, pour
+        qu'un index partiellement écrit ne soit jamais lu. Rien n'est écrit si
+        le répertoire du cache est en lecture seule (ex: volume monté en :ro).
+        """
+        if not os.access(self.index_file.parent, os.W_OK):
+            logger.debug(
+                f"Répertoire du cache en lecture seule, index API Géo non écrit: "
+                f"{self.index_file.parent}"
+            )
+            return
+
+        snapshot = (
+            _INDEX_SNAPSHOT_VERSION,
+            self._communes_cache,
+            self._communes_by_name,
+            self._communes_by_name_and_postal,
+            self._communes_by_name_and_department,
+        )
+        tmp_file = self.index_file.with_suffix(".pkl.tmp")
+        try:
+            with open(tmp_file, "wb") as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, self.index_file)
+        except (OSError, pickle.PicklingError) as e:
+            logger.warning(f"Impossible d'écrire l'index API Géo: {e}")
+            tmp_file.unlink(missing_ok=True)
+
     def _load_communes_from_cache(self) -> None:
         """
         Charge les données des communes depuis le fichier de cache.
         """
         try:
-            with open(self.cache_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(self.cache_file, "rb") as f:
+                data = orjson.loads(f.read())
 
             # Parser les données et créer les objets CommuneGeoApi
             for commune_data in data:
-                commune = CommuneGeoApi(
-                    nom=commune_data["nom"],
-                    code=commune_data["code"],
-                    centre=commune_data["centre"],
-                )
-                self._add_commune_to_index(commune)
+                self._add_commune_to_index(CommuneGeoApi.from_api(commune_data))
 
             logger.info(f"Cache API Géo chargé: {len(self._communes_cache)} communes")
-        except (json.JSONDecodeError, IOError, KeyError) as e:
+        except (orjson.JSONDecodeError, IOError, KeyError) as e:
             logger.warning(f"Erreur lors du chargement du cache API Géo: {e}")
             logger.info("Téléchargement des données depuis l'API...")
             self._download_communes_from_api()
@@ -200,17 +350,12 @@ class GeoApiService:
             self.cache_file.parent.mkdir(parents=True, exist_ok=True)
 
             # Sauvegarder les données dans le cache
-            with open(self.cache_file, "w", encoding="utf-8") as f:
-                json.dump(communes_data, f, ensure_ascii=False, indent=2)
+            with open(self.cache_file, "wb") as f:
+                f.write(orjson.dumps(communes_data, option=orjson.OPT_INDENT_2))
 
             # Parser les données et créer les objets CommuneGeoApi
             for commune_data in communes_data:
-                commune = CommuneGeoApi(
-                    nom=commune_data["nom"],
-                    code=commune_data["code"],
-                    centre=commune_data["centre"],
-                )
-                self._add_commune_to_index(commune)
+                self._add_commune_to_index(CommuneGeoApi.from_api(commune_data))
 
             logger.info(f"Cache API Géo téléchargé et sauvegardé: {len(self._communes_cache)} communes")
 
@@ -233,6 +378,43 @@ class GeoApiService:
             self._communes_by_name[normalized_name] = []
         self._communes_by_name[normalized_name].append(commune)
 
+        # Index par nom et code postal (la première commune ajoutée est conservée)
+        self._communes_by_name_and_postal.setdefault(
+            (normalized_name, commune.postal_code), commune
+        )
+        self._communes_by_name_and_department.setdefault(
+            (normalized_name, commune.postal_code[:2]), commune
+        )
+
+    def _get_retry_delay(self, attempt: int, error: requests.RequestException) -> float:
+        """
+        Calcule le délai d'attente avant la tentative suivante.
+
+        Le délai suit un backoff exponentiel avec jitter complet (tirage
+        uniforme entre 0 et retry_delay * 2^(attempt-1), plafonné à
+        GEO_API_MAX_RETRY_DELAY), afin que plusieurs clients limités en
+        même temps ne réessaient pas de façon synchronisée. Pour une réponse
+        429 ou 503, l'en-tête Retry-After est respecté s'il est présent.
+
+        Args:
+            attempt: Numéro de la tentative qui vient d'échouer (à partir de 1)
+            error: Exception levée par la tentative
+
+        Returns:
+            Délai d'attente en secondes
+        """
+        delay = random.uniform(
+            0, min(GEO_API_MAX_RETRY_DELAY, self.retry_delay * (2 ** (attempt - 1)))
+        )
+
+        response = error.response
+        if response is not None and response.status_code in (429, 503):
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+
+        return delay
+
     def _make_geo_api_request(self) -> List[Dict[str, Any]]:
         """
         Effectue une requête à l'API Géo avec retry.
@@ -249,12 +431,17 @@ class GeoApiService:
         for attempt in range(1, self.max_retries + 1):
             try:
                 logger.info(f"Requête API Géo (tentative {attempt}/{self.max_retries})...")
-                response = requests.get(url, timeout=60)
+                response = self._session.get(url, timeout=60)
 
                 # Vérifier le code de statut HTTP
                 response.raise_for_status()
 
-                return response.json()
+                try:
+                    return orjson.loads(response.content)
+                except orjson.JSONDecodeError as e:
+                    raise requests.exceptions.InvalidJSONError(
+                        f"Réponse JSON invalide: {e}", response=response
+                    ) from e
 
             except requests.RequestException as e:
                 last_exception = e
@@ -263,7 +450,7 @@ class GeoApiService:
                 )
 
                 if attempt < self.max_retries:
-                    time.sleep(self.retry_delay * attempt)  # Backoff exponentiel
+                    time.sleep(self._get_retry_delay(attempt, e))  # Backoff exponentiel avec jitter
 
         # Si on arrive ici, toutes les tentatives ont échoué
         raise requests.RequestException(
@@ -295,18 +482,15 @@ class GeoApiService:
             return communes[0]
 
         # Si plusieurs communes ont le même nom, utiliser le code postal pour filtrer
-        for commune in communes:
-            # Générer le code postal possible depuis le code INSEE
-            commune_postal = commune.get_postal_code()
-            if commune_postal == code_postal_clean:
-                return commune
+        commune = self._communes_by_name_and_postal.get((normalized_name, code_postal_clean))
+        if commune is not None:
+            return commune
 
         # Si aucune correspondance exacte, essayer une correspondance partielle
         # (pour les communes avec plusieurs codes postaux)
-        for commune in communes:
-            commune_postal = commune.get_postal_code()
-            if commune_postal.startswith(code_postal_clean[:2]):
-                return commune
+        commune = self._communes_by_name_and_department.get((normalized_name, code_postal_clean[:2]))
+        if commune is not None:
+            return commune
 
         # Retourner la première commune si aucune correspondance exacte
         logger.debug(
@@ -326,19 +510,13 @@ class GeoApiService:
         Returns:
             GeocodingResult
         """
-        # Extraire les coordonnées depuis le format GeoJSON
-        # Format: {"type": "Point", "coordinates": [longitude, latitude]}
-        coordinates = commune.centre.get("coordinates", [0, 0])
-        longitude = float(coordinates[0])
-        latitude = float(coordinates[1])
-
         return GeocodingResult(
-            latitude=latitude,
-            longitude=longitude,
+            latitude=commune.latitude,
+            longitude=commune.longitude,
             source=source,
             display_name=f"{commune.nom}, France",
             city=commune.nom,
-            postcode=commune.get_postal_code(),
+            postcode=commune.postal_code,
         )
 
     def geocode(self, city_name: str, code_postal: str) -> Optional[GeocodingResult]:
@@ -354,6 +532,8 @@ class GeoApiService:
         Returns:
             GeocodingResult si le géocodage réussit, None sinon
         """
+        self._ensure_loaded()
+
         # Vérifier si le cache des communes est disponible
         if not self._communes_cache:
             logger.warning("Cache des communes vide, impossible de géocoder")
@@ -365,7 +545,7 @@ class GeoApiService:
         if commune:
             logger.info(
                 f"Géocodage réussi pour {city_name} ({code_postal}) "
-                f"via API Géo: {commune.centre['coordinates'][1]}, {commune.centre['coordinates'][0]}"
+                f"via API Géo: {commune.latitude}, {commune.longitude}"
             )
             return self._commune_to_geocoding_result(commune, source="geo_api")
 
@@ -385,7 +565,10 @@ class GeoApiService:
         self.force_refresh = True
         self._communes_cache.clear()
         self._communes_by_name.clear()
+        self._communes_by_name_and_postal.clear()
+        self._communes_by_name_and_department.clear()
         self._load_communes_data()
+        self._loaded = True
         self.force_refresh = False
         logger.info("Rechargement des communes terminé")
 
@@ -396,6 +579,7 @@ class GeoApiService:
         Returns:
             Nombre de communes
         """
+        self._ensure_loaded()
         return len(self._communes_cache)
 
     def is_cache_loaded(self) -> bool:
@@ -405,4 +589,5 @@ class GeoApiService:
         Returns:
             True si le cache est chargé, False sinon
         """
+        self._ensure_loaded()
         return len(self._communes_cache) > 0
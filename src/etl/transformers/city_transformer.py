@@ -9,7 +9,7 @@ from typing import Iterator, Dict, Any, Optional, Tuple, List
 
 from src.etl.transformers.base_transformer import BaseTransformer
 from src.etl.utils.data_models import CityData
-from src.etl.utils.csv_helpers import get_csv_value, normalize_name
+from src.etl.utils.csv_helpers import get_csv_value, normalize_name_cached
 from src.etl.services.geo_api import GeoApiService, GeocodingResult
 
 
@@ -59,9 +59,12 @@ class CityTransformer(BaseTransformer[CityData]):
         Returns:
             Tuple (city_name, code_postal, department_name) ou None si données invalides
         """
-        city_name = get_csv_value(row, "nom_commune")
-        code_postal = get_csv_value(row, "code_postal")
-        department_name = get_csv_value(row, "nom_departement")
+        # Chemin critique (une fois par ligne) : get_csv_value inliné, le lecteur
+        # CSV produisant déjà des str
+        get = row.get
+        city_name = (get("nom_commune") or "").strip()
+        code_postal = (get("code_postal") or "").strip()
+        department_name = (get("nom_departement") or "").strip()
 
         # Vérifier que les colonnes requises sont présentes
         if not city_name or not code_postal:
@@ -85,9 +88,10 @@ class CityTransformer(BaseTransformer[CityData]):
         Returns:
             Tuple (normalized_name, normalized_code, normalized_dept) ou None si données invalides
         """
-        normalized_name = normalize_name(city_name)
-        normalized_code = code_postal.strip().zfill(5)  # Pad avec des zéros à gauche pour avoir exactement 5 caractères
-        normalized_dept = normalize_name(department_name) if department_name else None
+        # Les valeurs ont déjà été nettoyées (strip) par _extract_city_data
+        normalized_name = city_name.upper()
+        normalized_code = code_postal.zfill(5)  # Pad avec des zéros à gauche pour avoir exactement 5 caractères
+        normalized_dept = normalize_name_cached(department_name) if department_name else None
 
         if not normalized_name or not normalized_code:
             self.logger.warning(
@@ -195,6 +199,15 @@ class CityTransformer(BaseTransformer[CityData]):
             # Créer la clé unique pour la commune (nom + code postal)
             city_key = (normalized_name, normalized_code)
 
+            # Ignorer les doublons avant de lire les coordonnées : seule la
+            # première occurrence est conservée, inutile de parser ses
+            # coordonnées ou de la géocoder à nouveau
+            if city_key in cities_dict:
+                self.logger.debug(
+                    f"Commune en double détectée: {normalized_name} ({normalized_code})"
+                )
+                continue
+
             # Extraire les coordonnées GPS si disponibles dans le CSV
             latitude, longitude = self._extract_coordinates(row, normalized_name)
 
@@ -207,19 +220,14 @@ class CityTransformer(BaseTransformer[CityData]):
                         latitude = geocoded_lat
                         longitude = geocoded_lon
 
-            # Ajouter la commune si elle n'existe pas déjà
-            if city_key not in cities_dict:
-                cities_dict[city_key] = CityData(
-                    name=normalized_name,
-                    code_postal=normalized_code,
-                    department_name=normalized_dept,
-                    latitude=latitude,
-                    longitude=longitude,
-                )
-            else:
-                self.logger.debug(
-                    f"Commune en double détectée: {normalized_name} ({normalized_code})"
-                )
+            # Ajouter la commune
+            cities_dict[city_key] = CityData(
+                name=normalized_name,
+                code_postal=normalized_code,
+                department_name=normalized_dept,
+                latitude=latitude,
+                longitude=longitude,
+            )
 
         # Convertir le dictionnaire en liste
         cities = list(cities_dict.values())
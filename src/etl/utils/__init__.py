@@ -12,6 +12,7 @@ from src.etl.utils.csv_helpers import (
     validate_csv_row,
     get_csv_value,
     normalize_name,
+    normalize_name_cached,
 )
 
 __all__ = [
@@ -23,4 +24,5 @@ __all__ = [
     "validate_csv_row",
     "get_csv_value",
     "normalize_name",
+    "normalize_name_cached",
 ]
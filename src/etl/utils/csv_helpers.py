@@ -5,6 +5,7 @@ Ce module fournit des fonctions d'aide pour valider, nettoyer et transformer
 les données provenant de fichiers CSV dans le pipeline ETL.
 """
 
+from functools import lru_cache
 from typing import Dict, Any, Optional
 
 
@@ -72,3 +73,21 @@ def normalize_name(name: str) -> str:
         Le nom en majuscules, sans espaces en trop
     """
     return clean_string(name).upper()
+
+
+@lru_cache(maxsize=4096)
+def normalize_name_cached(name: str) -> str:
+    """
+    Version mémoïsée de normalize_name.
+
+    À utiliser pour les valeurs qui se répètent sur de nombreuses lignes CSV
+    (régions, départements, codes) : chaque valeur distincte n'est normalisée
+    qu'une fois, et toutes les lignes partagent la même chaîne résultante.
+
+    Args:
+        name: Le nom à normaliser
+
+    Returns:
+        Le nom en majuscules, sans espaces en trop
+    """
+    return normalize_name(name)
@@ -4,13 +4,17 @@ Modèles de données intermédiaires pour le pipeline ETL.
 Ce module définit les structures de données utilisées pour représenter
 les informations extraites du CSV et transformées avant leur chargement
 en base de données.
+
+Les modèles utilisent des slots (pas de __dict__ par instance) ; RegionData
+et CityData sont en outre immuables. DepartmentData reste modifiable car
+region_id est renseigné après le chargement des régions.
 """
 
 from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RegionData:
     """
     Modèle de données intermédiaire pour une région.
@@ -27,7 +31,7 @@ class RegionData:
         return f"RegionData(name='{self.name}')"
 
 
-@dataclass
+@dataclass(slots=True)
 class DepartmentData:
     """
     Modèle de données intermédiaire pour un département.
@@ -50,7 +54,7 @@ class DepartmentData:
         return f"DepartmentData(name='{self.name}', code_departement='{self.code_departement}', region_name='{self.region_name}')"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CityData:
     """
     Modèle de données intermédiaire pour une commune.
@@ -59,7 +63,7 @@ class CityData:
     avant d'être chargée en base de données via CityCreate.
 
     Attributes:
-        name: Nom de la commune (ex: "PARIS")
+        name: Nom normalisé de la commune, en majuscules (ex: "PARIS")
         code_postal: Code postal de la commune (ex: "75001")
         department_name: Nom du département (ex: "PARIS")
         latitude: Latitude GPS de la commune (optionnel)
@@ -3,7 +3,7 @@ Modèle représentant une région administrative française.
 """
 
 from typing import TYPE_CHECKING
-from sqlalchemy import String, Index
+from sqlalchemy import String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.model.base import Base
 
@@ -25,9 +25,9 @@ class Region(Base):
         comment="Nom de la région (ex: Île-de-France)"
     )
 
-    # Index pour optimiser les recherches par nom
+    # La contrainte d'unicité crée l'index utilisé pour les recherches par nom
     __table_args__ = (
-        Index('ix_region_name', 'name'),
+        UniqueConstraint('name', name='uq_region_name'),
     )
 
     departments: Mapped[list["Department"]] = relationship(
@@ -1,6 +1,6 @@
 """Repository pour City."""
 
-from typing import List, Optional, Union, Dict, Any
+from typing import List, Optional, Union, Dict, Any, Tuple
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 from src.model.city import City
@@ -79,6 +79,21 @@ class CityRepository(BaseRepository[City, CityCreate, CityUpdate]):
         )
         return self.db.execute(stmt).scalar_one_or_none()
 
+    def get_ids_by_name_and_postal_code(self) -> Dict[Tuple[str, str], int]:
+        """
+        Récupère les identifiants de toutes les villes actives.
+
+        Seules les colonnes id, name et code_postal sont lues, sans instancier
+        d'objets ORM.
+
+        Returns:
+            Dictionnaire {(nom, code postal): id}
+        """
+        stmt = select(City.id, City.name, City.code_postal).where(
+            City.deleted_at.is_(None)
+        )
+        return {(name, code_postal): city_id for city_id, name, code_postal in self.db.execute(stmt)}
+
     def get_or_create(self, city_in: Union[CityCreate, Dict[str, Any]]) -> City:
         """
         Récupère une ville existante ou la crée si elle n'existe pas (upsert).
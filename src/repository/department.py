@@ -44,3 +44,15 @@ class DepartmentRepository(BaseRepository[Department, DepartmentCreate, Departme
         )
         departments = list(self.db.execute(stmt).scalars().all())
         return {dept.code_departement: dept for dept in departments}
+
+    def get_all_ids_by_code(self) -> Dict[str, int]:
+        """
+        Récupère les identifiants de tous les départements actifs.
+
+        Returns:
+            Dictionnaire avec les codes départements comme clés et les IDs comme valeurs
+        """
+        stmt = select(Department.code_departement, Department.id).where(
+            Department.deleted_at.is_(None)
+        )
+        return {code: dept_id for code, dept_id in self.db.execute(stmt)}